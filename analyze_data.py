@@ -3,15 +3,13 @@ Survey Data Analysis Script
 Analyzes umfrage.csv and outputs results.csv and assessment.txt
 """
 
+import csv
+import os
+
 import pandas as pd
 import numpy as np
-from scipy import stats
-
 
-def load_data(filepath: str) -> pd.DataFrame:
-    """Load the survey data from CSV with § separator."""
-    df = pd.read_csv(filepath, sep='§', encoding='utf-8', engine='python')
-    return df
+from survey_data import load_data, category_mask
 
 
 def compute_statistics(df: pd.DataFrame) -> dict:
@@ -19,63 +17,76 @@ def compute_statistics(df: pd.DataFrame) -> dict:
     Compute mean and median for key columns, grouped by Item Type.
     Returns a dictionary with all statistics.
     """
+    # One grouped pass for the ratings and one for the age answers
+    rating_stats = df.groupby('Item Type', observed=True)[['Emotional', 'Pos / Neg']].agg(['mean', 'median'])
+    age_stats = df.groupby(['Item Type', 'Age Question Type'], observed=True)['Age Answer'].agg(['mean', 'median'])
+    
     results = {}
     
     for item_type in ['Stimulus', 'Distraktor']:
-        subset = df[df['Item Type'] == item_type]
         prefix = item_type.lower()
         
-        # Emotional column
-        results[f'{prefix}_emotional_mean'] = subset['Emotional'].mean()
-        results[f'{prefix}_emotional_median'] = subset['Emotional'].median()
+        # Emotional and Pos / Neg columns
+        for column, name in [('Emotional', 'emotional'), ('Pos / Neg', 'pos_neg')]:
+            for stat in ['mean', 'median']:
+                results[f'{prefix}_{name}_{stat}'] = rating_stats[(column, stat)].get(item_type, np.nan)
         
-        # Pos / Neg column
-        results[f'{prefix}_pos_neg_mean'] = subset['Pos / Neg'].mean()
-        results[f'{prefix}_pos_neg_median'] = subset['Pos / Neg'].median()
-        
-        # Suitability Age (Age Answer where Age Question Type == 'suitability')
-        suitability = subset[subset['Age Question Type'] == 'suitability']['Age Answer']
-        results[f'{prefix}_suitability_age_mean'] = suitability.mean()
-        results[f'{prefix}_suitability_age_median'] = suitability.median()
-        
-        # Recommended Age (Age Answer where Age Question Type == 'age_recommendation')
-        recommended = subset[subset['Age Question Type'] == 'age_recommendation']['Age Answer']
-        results[f'{prefix}_recommended_age_mean'] = recommended.mean()
-        results[f'{prefix}_recommended_age_median'] = recommended.median()
+        # Suitability / Recommended Age (Age Answer split by Age Question Type)
+        for q_type, name in [('suitability', 'suitability_age'), ('age_recommendation', 'recommended_age')]:
+            for stat in ['mean', 'median']:
+                results[f'{prefix}_{name}_{stat}'] = age_stats[stat].get((item_type, q_type), np.nan)
     
     return results
 
 
-def compute_correlations(df: pd.DataFrame) -> dict:
+def build_masks(df: pd.DataFrame) -> dict:
+    """
+    Build a boolean row mask per Age Question Type once, so callers can reuse them.
+    The masks compare categorical codes rather than strings.
+    """
+    return {
+        q_type: category_mask(df['Age Question Type'], q_type)
+        for q_type in ['suitability', 'age_recommendation']
+    }
+
+
+def pearson_correlation(x: np.ndarray, y: np.ndarray) -> float:
+    """Pearson correlation coefficient of two equally long arrays."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    xm = x - x.mean()
+    ym = y - y.mean()
+    denominator = np.sqrt(np.dot(xm, xm) * np.dot(ym, ym))
+    return float(np.dot(xm, ym) / denominator) if denominator else float('nan')
+
+
+def compute_correlations(df: pd.DataFrame, masks: dict) -> dict:
     """
     Compute Pearson correlations between Pos/Neg, Emotional, and Age columns.
     - emotional_vs_pos_neg: computed on ALL data
     - Age correlations: computed separately for suitability and age_recommendation question types
+    The masks come from build_masks().
     """
     correlations = {}
+    emotional = df['Emotional'].to_numpy(dtype=np.float64)
+    pos_neg = df['Pos / Neg'].to_numpy(dtype=np.float64)
+    age = df['Age Answer'].to_numpy(dtype=np.float64)
     
     # Emotional vs Pos/Neg - computed on ALL data
     if len(df) > 2:
-        corr, _ = stats.pearsonr(df['Emotional'], df['Pos / Neg'])
-        correlations['emotional_vs_pos_neg'] = corr
+        correlations['emotional_vs_pos_neg'] = pearson_correlation(emotional, pos_neg)
     
     # Suitability age correlations
-    suitability_data = df[df['Age Question Type'] == 'suitability']
-    if len(suitability_data) > 2:
-        corr, _ = stats.pearsonr(suitability_data['Emotional'], suitability_data['Age Answer'])
-        correlations['emotional_vs_age_suitability'] = corr
-        
-        corr, _ = stats.pearsonr(suitability_data['Pos / Neg'], suitability_data['Age Answer'])
-        correlations['pos_neg_vs_age_suitability'] = corr
+    suitability = masks['suitability']
+    if suitability.sum() > 2:
+        correlations['emotional_vs_age_suitability'] = pearson_correlation(emotional[suitability], age[suitability])
+        correlations['pos_neg_vs_age_suitability'] = pearson_correlation(pos_neg[suitability], age[suitability])
     
     # Recommended age correlations
-    recommended_data = df[df['Age Question Type'] == 'age_recommendation']
-    if len(recommended_data) > 2:
-        corr, _ = stats.pearsonr(recommended_data['Emotional'], recommended_data['Age Answer'])
-        correlations['emotional_vs_age_recommended'] = corr
-        
-        corr, _ = stats.pearsonr(recommended_data['Pos / Neg'], recommended_data['Age Answer'])
-        correlations['pos_neg_vs_age_recommended'] = corr
+    recommended = masks['age_recommendation']
+    if recommended.sum() > 2:
+        correlations['emotional_vs_age_recommended'] = pearson_correlation(emotional[recommended], age[recommended])
+        correlations['pos_neg_vs_age_recommended'] = pearson_correlation(pos_neg[recommended], age[recommended])
     
     return correlations
 
@@ -85,98 +96,127 @@ def write_results(statistics: dict, correlations: dict, filepath: str):
     # Combine all results
     all_results = {**statistics, **correlations}
     
-    # Create DataFrame with metric names and values
-    results_df = pd.DataFrame([
-        {'Metric': k, 'Value': v} for k, v in all_results.items()
-    ])
+    # One row per metric; missing values are written as empty fields
+    with open(filepath, 'w', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['Metric', 'Value'])
+        writer.writerows((k, '' if np.isnan(v) else v) for k, v in all_results.items())
     
-    results_df.to_csv(filepath, index=False)
     print(f"Results written to {filepath}")
 
 
 def assess_data(df: pd.DataFrame, filepath: str):
     """Assess data completeness and write findings to a text file."""
+    parts = []
+    parts.append("DATA QUALITY ASSESSMENT\n")
+    parts.append("=" * 50 + "\n\n")
+    
+    # Basic info
+    parts.append(f"Total rows: {len(df)}\n")
+    parts.append(f"Total columns: {len(df.columns)}\n\n")
+    
+    # Unique participants
+    unique_participants = df['Participant ID'].nunique()
+    parts.append(f"Unique participants: {unique_participants}\n\n")
+    
+    # Item type distribution
+    parts.append("Item Type distribution:\n")
+    for item_type, count in df['Item Type'].value_counts().items():
+        parts.append(f"  - {item_type}: {count} rows\n")
+    parts.append("\n")
+    
+    # Age Question Type distribution
+    parts.append("Age Question Type distribution:\n")
+    for q_type, count in df['Age Question Type'].value_counts().items():
+        parts.append(f"  - {q_type}: {count} rows\n")
+    parts.append("\n")
+    
+    # Missing values
+    parts.append("Missing values per column:\n")
+    missing = df.isnull().sum()
+    has_missing = False
+    for col, count in missing.items():
+        if count > 0:
+            parts.append(f"  - {col}: {count} missing\n")
+            has_missing = True
+    if not has_missing:
+        parts.append("  No missing values found.\n")
+    parts.append("\n")
+    
+    # Duplicate rows
+    duplicates = df.duplicated().sum()
+    parts.append(f"Duplicate rows: {duplicates}\n")
+    if duplicates > 0:
+        parts.append("  WARNING: There are duplicate rows in the dataset.\n")
+        # Show which rows are duplicated
+        dup_rows = df[df.duplicated(keep=False)]
+        parts.append(f"  Rows involved in duplication: {len(dup_rows)}\n")
+    parts.append("\n")
+    
+    # Check for zero/null answers (potential invalid responses)
+    zero_emotional = (df['Emotional'] == 0).sum()
+    zero_pos_neg = (df['Pos / Neg'] == 0).sum()
+    zero_age = (df['Age Answer'] == 0).sum()
+    
+    if zero_emotional > 0 or zero_pos_neg > 0 or zero_age > 0:
+        parts.append("Potential invalid responses (zero values):\n")
+        if zero_emotional > 0:
+            parts.append(f"  - Emotional = 0: {zero_emotional} rows\n")
+        if zero_pos_neg > 0:
+            parts.append(f"  - Pos / Neg = 0: {zero_pos_neg} rows\n")
+        if zero_age > 0:
+            parts.append(f"  - Age Answer = 0: {zero_age} rows\n")
+        parts.append("\n")
+    
+    # Summary
+    parts.append("=" * 50 + "\n")
+    parts.append("SUMMARY:\n")
+    if duplicates == 0 and not has_missing:
+        parts.append("The data appears to be complete with no missing values.\n")
+    else:
+        parts.append("The data has some quality issues that may need attention.\n")
+    
+    if duplicates > 0:
+        parts.append(f"- {duplicates} duplicate rows should be reviewed.\n")
+    
     with open(filepath, 'w', encoding='utf-8') as f:
-        f.write("DATA QUALITY ASSESSMENT\n")
-        f.write("=" * 50 + "\n\n")
-        
-        # Basic info
-        f.write(f"Total rows: {len(df)}\n")
-        f.write(f"Total columns: {len(df.columns)}\n\n")
-        
-        # Unique participants
-        unique_participants = df['Participant ID'].nunique()
-        f.write(f"Unique participants: {unique_participants}\n\n")
-        
-        # Item type distribution
-        f.write("Item Type distribution:\n")
-        for item_type, count in df['Item Type'].value_counts().items():
-            f.write(f"  - {item_type}: {count} rows\n")
-        f.write("\n")
-        
-        # Age Question Type distribution
-        f.write("Age Question Type distribution:\n")
-        for q_type, count in df['Age Question Type'].value_counts().items():
-            f.write(f"  - {q_type}: {count} rows\n")
-        f.write("\n")
-        
-        # Missing values
-        f.write("Missing values per column:\n")
-        missing = df.isnull().sum()
-        has_missing = False
-        for col, count in missing.items():
-            if count > 0:
-                f.write(f"  - {col}: {count} missing\n")
-                has_missing = True
-        if not has_missing:
-            f.write("  No missing values found.\n")
-        f.write("\n")
-        
-        # Duplicate rows
-        duplicates = df.duplicated().sum()
-        f.write(f"Duplicate rows: {duplicates}\n")
-        if duplicates > 0:
-            f.write("  WARNING: There are duplicate rows in the dataset.\n")
-            # Show which rows are duplicated
-            dup_rows = df[df.duplicated(keep=False)]
-            f.write(f"  Rows involved in duplication: {len(dup_rows)}\n")
-        f.write("\n")
-        
-        # Check for zero/null answers (potential invalid responses)
-        zero_emotional = (df['Emotional'] == 0).sum()
-        zero_pos_neg = (df['Pos / Neg'] == 0).sum()
-        zero_age = (df['Age Answer'] == 0).sum()
-        
-        if zero_emotional > 0 or zero_pos_neg > 0 or zero_age > 0:
-            f.write("Potential invalid responses (zero values):\n")
-            if zero_emotional > 0:
-                f.write(f"  - Emotional = 0: {zero_emotional} rows\n")
-            if zero_pos_neg > 0:
-                f.write(f"  - Pos / Neg = 0: {zero_pos_neg} rows\n")
-            if zero_age > 0:
-                f.write(f"  - Age Answer = 0: {zero_age} rows\n")
-            f.write("\n")
-        
-        # Summary
-        f.write("=" * 50 + "\n")
-        f.write("SUMMARY:\n")
-        if duplicates == 0 and not has_missing:
-            f.write("The data appears to be complete with no missing values.\n")
-        else:
-            f.write("The data has some quality issues that may need attention.\n")
-        
-        if duplicates > 0:
-            f.write(f"- {duplicates} duplicate rows should be reviewed.\n")
+        f.write(''.join(parts))
     
     print(f"Assessment written to {filepath}")
 
 
+def input_fingerprint(filepath: str) -> str:
+    """Fingerprint the input file by modification time and size."""
+    return f"{os.path.getmtime(filepath)}:{os.path.getsize(filepath)}"
+
+
+def is_up_to_date(output_file: str, fingerprint: str) -> bool:
+    """Check whether an output file was produced from the fingerprinted input."""
+    stamp_file = output_file + '.stamp'
+    if not (os.path.exists(output_file) and os.path.exists(stamp_file)):
+        return False
+    with open(stamp_file, encoding='utf-8') as f:
+        return f.read() == fingerprint
+
+
+def write_stamp(output_file: str, fingerprint: str):
+    """Record the input fingerprint next to an output file."""
+    with open(output_file + '.stamp', 'w', encoding='utf-8') as f:
+        f.write(fingerprint)
+
+
 def main():
     # File paths (relative to project root)
     input_file = '../data/input/umfrage.csv'
     results_file = '../data/output/results.csv'
     assessment_file = '../data/output/assessment.txt'
     
+    # Skip the run if the outputs were already produced from this input
+    fingerprint = input_fingerprint(input_file)
+    if is_up_to_date(results_file, fingerprint) and is_up_to_date(assessment_file, fingerprint):
+        print("Input unchanged since last run, nothing to do.")
+        return
+    
     # Load data
     print("Loading data...")
     df = load_data(input_file)
@@ -188,15 +228,18 @@ def main():
     
     # Compute correlations
     print("Computing correlations...")
-    correlations = compute_correlations(df)
+    masks = build_masks(df)
+    correlations = compute_correlations(df, masks)
     
     # Write results
     print("Writing results...")
     write_results(statistics, correlations, results_file)
+    write_stamp(results_file, fingerprint)
     
     # Assess data
     print("Assessing data quality...")
     assess_data(df, assessment_file)
+    write_stamp(assessment_file, fingerprint)
     
     print("\nDone!")
 
@@ -5,17 +5,57 @@ Displays original data, computed statistics, and histograms.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
+from survey_data import load_data, category_mask
 
-@st.cache_data
+
+@st.cache_resource
 def load_survey_data():
-    """Load the original survey data."""
-    df = pd.read_csv('data/input/umfrage.csv', sep='§', encoding='utf-8', engine='python')
+    """Load the original survey data once and share it across reruns."""
+    df = load_data('data/input/umfrage.csv')
     return df
 
 
+def histogram_figure(df: pd.DataFrame, column: str, title: str) -> go.Figure:
+    """
+    Overlaid histogram of an integer answer column per Item Type.
+    Bin counts are computed here so only the counts are sent to the browser.
+    """
+    values = df[column].to_numpy(dtype=np.float64)
+    answered = values[~np.isnan(values)]
+    low, high = (answered.min(), answered.max()) if len(answered) else (0, 0)
+    edges = np.arange(low, high + 2) - 0.5  # One bin per integer answer
+    
+    fig = go.Figure()
+    for item_type, color in {'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}.items():
+        counts, _ = np.histogram(values[category_mask(df['Item Type'], item_type)], bins=edges)
+        fig.add_trace(go.Bar(x=edges[:-1] + 0.5, y=counts, name=item_type, marker={'color': color, 'opacity': 0.5}))
+    fig.update_layout(
+        barmode='overlay',
+        bargap=0.1,
+        title=title,
+        xaxis_title=column,
+        yaxis_title='count',
+        legend_title_text='Item Type'
+    )
+    return fig
+
+
+@st.cache_resource
+def precompute_views():
+    """Precompute the filter options and age question subsets used by the tabs."""
+    df = load_survey_data()
+    return {
+        'participants': sorted(df['Participant ID'].unique().tolist()),
+        'item_types': sorted(df['Item Type'].unique().tolist()),
+        'suitability': df[category_mask(df['Age Question Type'], 'suitability')],
+        'recommended': df[category_mask(df['Age Question Type'], 'age_recommendation')],
+    }
+
+
 @st.cache_data
 def load_results():
     """Load the computed results."""
@@ -23,6 +63,211 @@ def load_results():
     return df
 
 
+def render_data_table(df: pd.DataFrame, views: dict):
+    """Render the original survey data with participant and item type filters."""
+    st.header("Original Survey Data")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Filter by Participant ID
+        participants = ['All'] + views['participants']
+        selected_participant = st.selectbox("Filter by Participant ID", participants)
+    
+    with col2:
+        # Filter by Item Type
+        item_types = ['All'] + views['item_types']
+        selected_item_type = st.selectbox("Filter by Item Type", item_types)
+    
+    # Apply filters
+    mask = np.ones(len(df), dtype=bool)
+    if selected_participant != 'All':
+        mask &= category_mask(df['Participant ID'], selected_participant)
+    if selected_item_type != 'All':
+        mask &= category_mask(df['Item Type'], selected_item_type)
+    filtered_df = df[mask]
+    
+    st.write(f"Showing **{len(filtered_df)}** of {len(df)} rows")
+    st.dataframe(filtered_df, width='stretch', height=500)
+
+
+def render_statistics(results: pd.DataFrame):
+    """Render the computed means, medians and correlations."""
+    st.header("Computed Statistics")
+    
+    # Parse results into a more usable format
+    stats_df = results['Metric'].str.extract(
+        r'^(stimulus|distraktor)_(emotional|pos_neg|suitability_age|recommended_age)_(mean|median)$'
+    )
+    stats_df.columns = ['Item Type', 'Column', 'Statistic']
+    stats_df['Value'] = results['Value']
+    stats_df = stats_df.dropna(subset=['Item Type'])  # Correlations are handled separately
+    
+    stats_df['Item Type'] = stats_df['Item Type'].str.capitalize()
+    stats_df['Column'] = stats_df['Column'].map({
+        'emotional': 'Emotional',
+        'pos_neg': 'Pos / Neg',
+        'suitability_age': 'Suitability Age',
+        'recommended_age': 'Recommended Age',
+    })
+    stats_df['Statistic'] = stats_df['Statistic'].str.capitalize()
+    
+    # Mean/Median charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Mean Values")
+        mean_df = stats_df[stats_df['Statistic'] == 'Mean']
+        fig = px.bar(
+            mean_df,
+            x='Column',
+            y='Value',
+            color='Item Type',
+            barmode='group',
+            title='Mean by Column and Item Type',
+            color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig)
+    
+    with col2:
+        st.subheader("Median Values")
+        median_df = stats_df[stats_df['Statistic'] == 'Median']
+        fig = px.bar(
+            median_df,
+            x='Column',
+            y='Value',
+            color='Item Type',
+            barmode='group',
+            title='Median by Column and Item Type',
+            color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        st.plotly_chart(fig)
+    
+    # Correlations
+    st.subheader("Correlations")
+    
+    corr_rows = results[results['Metric'].str.contains('_vs_', regex=False)]
+    corr_df = pd.DataFrame({
+        'Correlation': corr_rows['Metric'].str.replace('_', ' ').str.title(),
+        'Value': corr_rows['Value']
+    })
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        fig = px.bar(
+            corr_df,
+            x='Correlation',
+            y='Value',
+            title='Pearson Correlations',
+            color='Value',
+            color_continuous_scale='RdBu_r',
+            range_color=[-1, 1]
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        fig.add_hline(y=0, line_dash="dash", line_color="gray")
+        st.plotly_chart(fig)
+    
+    with col2:
+        st.markdown("**Correlation Values:**")
+        for _, row in corr_df.iterrows():
+            val = row['Value']
+            color = "🟢" if abs(val) > 0.5 else "🟡" if abs(val) > 0.3 else "⚪"
+            st.write(f"{color} {row['Correlation']}: **{val:.3f}**")
+
+
+def render_distributions(df: pd.DataFrame, views: dict):
+    """Render histograms and box plots of the answer columns."""
+    st.header("Data Distributions")
+    
+    # Emotional histogram
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Emotional")
+        fig = histogram_figure(df, 'Emotional', 'Distribution of Emotional Ratings')
+        st.plotly_chart(fig)
+    
+    with col2:
+        st.subheader("Pos / Neg")
+        fig = histogram_figure(df, 'Pos / Neg', 'Distribution of Pos/Neg Ratings')
+        st.plotly_chart(fig)
+    
+    # Age histograms - split by question type
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Suitability Age")
+        suitability_df = views['suitability']
+        fig = histogram_figure(suitability_df, 'Age Answer', 'Distribution of Suitability Age')
+        st.plotly_chart(fig)
+    
+    with col2:
+        st.subheader("Recommended Age")
+        recommended_df = views['recommended']
+        fig = histogram_figure(recommended_df, 'Age Answer', 'Distribution of Recommended Age')
+        st.plotly_chart(fig)
+    
+    # Additional: Box plots
+    st.subheader("Box Plots by Item Type")
+    st.caption("Solid line = median, dashed line = mean")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = px.box(
+            df,
+            x='Item Type',
+            y='Emotional',
+            color='Item Type',
+            title='Emotional Ratings by Item Type',
+            color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
+        )
+        fig.update_traces(boxmean=True)
+        st.plotly_chart(fig)
+    
+    with col2:
+        fig = px.box(
+            df,
+            x='Item Type',
+            y='Pos / Neg',
+            color='Item Type',
+            title='Pos/Neg Ratings by Item Type',
+            color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
+        )
+        fig.update_traces(boxmean=True)
+        st.plotly_chart(fig)
+    
+    # Box plots for Age columns
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = px.box(
+            suitability_df,
+            x='Item Type',
+            y='Age Answer',
+            color='Item Type',
+            title='Suitability Age by Item Type',
+            color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
+        )
+        fig.update_traces(boxmean=True)
+        st.plotly_chart(fig)
+    
+    with col2:
+        fig = px.box(
+            recommended_df,
+            x='Item Type',
+            y='Age Answer',
+            color='Item Type',
+            title='Recommended Age by Item Type',
+            color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
+        )
+        fig.update_traces(boxmean=True)
+        st.plotly_chart(fig)
+
+
 def main():
     st.set_page_config(
         page_title="Survey Data Analysis",
@@ -35,265 +280,24 @@ def main():
     
     # Load data
     df = load_survey_data()
+    views = precompute_views()
     results = load_results()
     
-    # Create tabs
-    tab1, tab2, tab3 = st.tabs(["📈 Computed Statistics", "📊 Histograms", "📋 Data Table"])
-    
-    # ==================== TAB 1: Data Table ====================
-    with tab3:
-        st.header("Original Survey Data")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Filter by Participant ID
-            participants = ['All'] + sorted(df['Participant ID'].unique().tolist())
-            selected_participant = st.selectbox("Filter by Participant ID", participants)
-        
-        with col2:
-            # Filter by Item Type
-            item_types = ['All'] + sorted(df['Item Type'].unique().tolist())
-            selected_item_type = st.selectbox("Filter by Item Type", item_types)
-        
-        # Apply filters
-        filtered_df = df.copy()
-        if selected_participant != 'All':
-            filtered_df = filtered_df[filtered_df['Participant ID'] == selected_participant]
-        if selected_item_type != 'All':
-            filtered_df = filtered_df[filtered_df['Item Type'] == selected_item_type]
-        
-        st.write(f"Showing **{len(filtered_df)}** of {len(df)} rows")
-        st.dataframe(filtered_df, width='stretch', height=500)
-    
-    # ==================== TAB 2: Computed Statistics ====================
-    with tab1:
-        st.header("Computed Statistics")
-        
-        # Parse results into a more usable format
-        stats_data = []
-        for _, row in results.iterrows():
-            metric = row['Metric']
-            value = row['Value']
-            
-            if 'correlation' in metric or '_vs_' in metric:
-                continue  # Handle correlations separately
-            
-            parts = metric.split('_')
-            item_type = parts[0].capitalize()
-            
-            if 'emotional' in metric:
-                column = 'Emotional'
-            elif 'pos_neg' in metric:
-                column = 'Pos / Neg'
-            elif 'suitability_age' in metric:
-                column = 'Suitability Age'
-            elif 'recommended_age' in metric:
-                column = 'Recommended Age'
-            else:
-                continue
-            
-            stat_type = 'Mean' if 'mean' in metric else 'Median'
-            stats_data.append({
-                'Item Type': item_type,
-                'Column': column,
-                'Statistic': stat_type,
-                'Value': value
-            })
-        
-        stats_df = pd.DataFrame(stats_data)
-        
-        # Mean/Median charts
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Mean Values")
-            mean_df = stats_df[stats_df['Statistic'] == 'Mean']
-            fig = px.bar(
-                mean_df,
-                x='Column',
-                y='Value',
-                color='Item Type',
-                barmode='group',
-                title='Mean by Column and Item Type',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig)
-        
-        with col2:
-            st.subheader("Median Values")
-            median_df = stats_df[stats_df['Statistic'] == 'Median']
-            fig = px.bar(
-                median_df,
-                x='Column',
-                y='Value',
-                color='Item Type',
-                barmode='group',
-                title='Median by Column and Item Type',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig)
-        
-        # Correlations
-        st.subheader("Correlations")
-        
-        corr_data = []
-        for _, row in results.iterrows():
-            if '_vs_' in row['Metric']:
-                corr_data.append({
-                    'Correlation': row['Metric'].replace('_', ' ').title(),
-                    'Value': row['Value']
-                })
-        
-        corr_df = pd.DataFrame(corr_data)
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            fig = px.bar(
-                corr_df,
-                x='Correlation',
-                y='Value',
-                title='Pearson Correlations',
-                color='Value',
-                color_continuous_scale='RdBu_r',
-                range_color=[-1, 1]
-            )
-            fig.update_layout(xaxis_tickangle=-45)
-            fig.add_hline(y=0, line_dash="dash", line_color="gray")
-            st.plotly_chart(fig)
-        
-        with col2:
-            st.markdown("**Correlation Values:**")
-            for _, row in corr_df.iterrows():
-                val = row['Value']
-                color = "🟢" if abs(val) > 0.5 else "🟡" if abs(val) > 0.3 else "⚪"
-                st.write(f"{color} {row['Correlation']}: **{val:.3f}**")
-    
-    # ==================== TAB 3: Histograms ====================
-    with tab2:
-        st.header("Data Distributions")
-        
-        # Emotional histogram
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Emotional")
-            fig = px.histogram(
-                df,
-                x='Emotional',
-                color='Item Type',
-                barmode='overlay',
-                nbins=7,
-                title='Distribution of Emotional Ratings',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_layout(bargap=0.1)
-            st.plotly_chart(fig)
-        
-        with col2:
-            st.subheader("Pos / Neg")
-            fig = px.histogram(
-                df,
-                x='Pos / Neg',
-                color='Item Type',
-                barmode='overlay',
-                nbins=7,
-                title='Distribution of Pos/Neg Ratings',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_layout(bargap=0.1)
-            st.plotly_chart(fig)
-        
-        # Age histograms - split by question type
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Suitability Age")
-            suitability_df = df[df['Age Question Type'] == 'suitability']
-            fig = px.histogram(
-                suitability_df,
-                x='Age Answer',
-                color='Item Type',
-                barmode='overlay',
-                title='Distribution of Suitability Age',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_layout(bargap=0.1)
-            st.plotly_chart(fig)
-        
-        with col2:
-            st.subheader("Recommended Age")
-            recommended_df = df[df['Age Question Type'] == 'age_recommendation']
-            fig = px.histogram(
-                recommended_df,
-                x='Age Answer',
-                color='Item Type',
-                barmode='overlay',
-                title='Distribution of Recommended Age',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_layout(bargap=0.1)
-            st.plotly_chart(fig)
-        
-        # Additional: Box plots
-        st.subheader("Box Plots by Item Type")
-        st.caption("Solid line = median, dashed line = mean")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.box(
-                df,
-                x='Item Type',
-                y='Emotional',
-                color='Item Type',
-                title='Emotional Ratings by Item Type',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_traces(boxmean=True)
-            st.plotly_chart(fig)
-        
-        with col2:
-            fig = px.box(
-                df,
-                x='Item Type',
-                y='Pos / Neg',
-                color='Item Type',
-                title='Pos/Neg Ratings by Item Type',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_traces(boxmean=True)
-            st.plotly_chart(fig)
-        
-        # Box plots for Age columns
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            fig = px.box(
-                suitability_df,
-                x='Item Type',
-                y='Age Answer',
-                color='Item Type',
-                title='Suitability Age by Item Type',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_traces(boxmean=True)
-            st.plotly_chart(fig)
-        
-        with col2:
-            fig = px.box(
-                recommended_df,
-                x='Item Type',
-                y='Age Answer',
-                color='Item Type',
-                title='Recommended Age by Item Type',
-                color_discrete_map={'Stimulus': '#636EFA', 'Distraktor': '#EF553B'}
-            )
-            fig.update_traces(boxmean=True)
-            st.plotly_chart(fig)
+    # Only the selected view is built on each rerun
+    view = st.radio(
+        "View",
+        ["📈 Computed Statistics", "📊 Histograms", "📋 Data Table"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="view"
+    )
+    
+    if view == "📈 Computed Statistics":
+        render_statistics(results)
+    elif view == "📊 Histograms":
+        render_distributions(df, views)
+    else:
+        render_data_table(df, views)
 
 
 if __name__ == '__main__':
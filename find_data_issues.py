@@ -4,12 +4,9 @@ Finds and reports duplicate rows and data issues with detailed information.
 """
 
 import pandas as pd
+import numpy as np
 
-
-def load_data(filepath: str) -> pd.DataFrame:
-    """Load the survey data from CSV with § separator."""
-    df = pd.read_csv(filepath, sep='§', encoding='utf-8', engine='python')
-    return df
+from survey_data import load_data
 
 
 def find_duplicates(df: pd.DataFrame) -> pd.DataFrame:
@@ -17,51 +14,82 @@ def find_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     Find duplicate rows and return detailed information.
     Returns a DataFrame with all duplicate rows including their row numbers.
     """
-    # Add row number (1-indexed to match CSV line numbers, +1 for header)
-    df_with_rows = df.copy()
-    df_with_rows['CSV Row Number'] = range(2, len(df) + 2)  # Line 1 is header
+    # Row numbers (1-indexed to match CSV line numbers, +1 for header)
+    row_numbers = np.arange(2, len(df) + 2)  # Line 1 is header
+    
+    # Only rows whose hash occurs more than once can be duplicates
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    _, inverse, counts = np.unique(row_hashes, return_inverse=True, return_counts=True)
+    candidates = np.flatnonzero(counts[inverse] > 1)
     
-    # Find duplicates (keep all occurrences)
-    duplicates = df_with_rows[df_with_rows.duplicated(subset=df.columns.tolist(), keep=False)]
+    # Confirm candidates by exact comparison (keep all occurrences)
+    mask = np.zeros(len(df), dtype=bool)
+    mask[candidates] = df.iloc[candidates].duplicated(keep=False).to_numpy()
+    duplicates = df.iloc[mask].assign(**{'CSV Row Number': row_numbers[mask]})
     
     return duplicates
 
 
+def group_duplicates(duplicates: pd.DataFrame, columns: list) -> list:
+    """
+    Split duplicate rows into groups of identical rows, in order of first occurrence.
+    Rows are grouped by a 64-bit hash of their values rather than by all columns.
+    """
+    row_hashes = pd.util.hash_pandas_object(duplicates[columns], index=False).to_numpy()
+    group_ids, _ = pd.factorize(row_hashes)
+    order = np.argsort(group_ids, kind='stable')
+    boundaries = np.flatnonzero(np.diff(group_ids[order])) + 1
+    
+    groups = []
+    for rows in np.split(order, boundaries):
+        group = duplicates.iloc[rows]
+        # Fall back to exact grouping if different rows share a hash
+        if group[columns].duplicated().sum() == len(group) - 1:
+            groups.append(group)
+        else:
+            groups.extend(g for _, g in group.groupby(columns, observed=True, sort=False, dropna=False))
+    
+    return groups
+
+
 def find_zero_values(df: pd.DataFrame) -> pd.DataFrame:
     """
     Find rows with zero values in numeric columns (potential invalid responses).
     """
-    df_with_rows = df.copy()
-    df_with_rows['CSV Row Number'] = range(2, len(df) + 2)
+    row_numbers = np.arange(2, len(df) + 2)
     
-    zero_mask = (df['Emotional'] == 0) | (df['Pos / Neg'] == 0) | (df['Age Answer'] == 0)
-    zero_rows = df_with_rows[zero_mask]
+    zero_mask = ((df['Emotional'] == 0) | (df['Pos / Neg'] == 0) | (df['Age Answer'] == 0)).to_numpy()
+    zero_rows = df.iloc[zero_mask].assign(**{'CSV Row Number': row_numbers[zero_mask]})
     
     return zero_rows
 
 
-def check_participant_completeness(df: pd.DataFrame) -> dict:
+def check_participant_completeness(pid_codes: np.ndarray, pref_codes: np.ndarray,
+                                   participants: list, questions: list) -> dict:
     """
     Check if every participant has answered all questions.
     Questions are identified by their Page Ref.
+    Takes the factorized Participant ID and Page Ref codes with their labels.
     Returns a dict with missing info per participant.
     """
-    # Get all unique questions (by Page Ref)
-    all_questions = set(df['Page Ref'].unique())
+    all_participants = list(participants)
+    all_questions = list(questions)
+    n_questions = len(all_questions)
     
-    # Get all unique participants
-    all_participants = df['Participant ID'].unique()
+    # Participant x question table of whether the question was answered
+    valid = (pid_codes >= 0) & (pref_codes >= 0)
+    counts = np.bincount(pid_codes[valid] * n_questions + pref_codes[valid],
+                         minlength=len(all_participants) * n_questions)
+    answered = counts.reshape(len(all_participants), n_questions) > 0
     
-    # Check each participant
-    missing = {}
-    for participant in all_participants:
-        participant_answers = set(df[df['Participant ID'] == participant]['Page Ref'].unique())
-        missing_questions = all_questions - participant_answers
-        if missing_questions:
-            missing[participant] = sorted(missing_questions)
+    # Questions with no answer per participant
+    missing = {
+        all_participants[p]: [all_questions[q] for q in np.flatnonzero(~answered[p])]
+        for p in np.flatnonzero(~answered.all(axis=1))
+    }
     
     return {
-        'all_questions': sorted(all_questions),
+        'all_questions': all_questions,
         'total_questions': len(all_questions),
         'total_participants': len(all_participants),
         'missing_by_participant': missing,
@@ -76,80 +104,97 @@ def main():
     print("Loading data...")
     df = load_data(input_file)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("DETAILED DATA ISSUES REPORT\n")
-        f.write("=" * 70 + "\n\n")
-        
-        # ==================== DUPLICATES ====================
-        f.write("DUPLICATE ROWS\n")
-        f.write("-" * 70 + "\n\n")
-        
-        duplicates = find_duplicates(df)
-        
-        if len(duplicates) == 0:
-            f.write("No duplicate rows found.\n\n")
-        else:
-            f.write(f"Found {len(duplicates)} rows involved in duplication:\n\n")
-            
-            # Group duplicates to show which rows are duplicates of each other
-            dup_groups = duplicates.groupby(list(df.columns))
-            
-            group_num = 1
-            for _, group in dup_groups:
-                if len(group) > 1:
-                    f.write(f"Duplicate Group {group_num}:\n")
-                    for _, row in group.iterrows():
-                        f.write(f"  - CSV Row: {row['CSV Row Number']}, ")
-                        f.write(f"Participant ID: {row['Participant ID']}, ")
-                        f.write(f"Timestamp: {row['Timestamp']}\n")
-                        f.write(f"    Text: {row['Text'][:60]}...\n")
-                    f.write("\n")
-                    group_num += 1
-        
-        # ==================== ZERO VALUES ====================
-        f.write("\nROWS WITH ZERO VALUES (POTENTIAL INVALID RESPONSES)\n")
-        f.write("-" * 70 + "\n\n")
-        
-        zero_rows = find_zero_values(df)
-        
-        if len(zero_rows) == 0:
-            f.write("No rows with zero values found.\n\n")
-        else:
-            f.write(f"Found {len(zero_rows)} rows with zero values:\n\n")
-            
-            for _, row in zero_rows.iterrows():
-                f.write(f"CSV Row: {row['CSV Row Number']}\n")
-                f.write(f"  Participant ID: {row['Participant ID']}\n")
-                f.write(f"  Timestamp: {row['Timestamp']}\n")
-                f.write(f"  Item Type: {row['Item Type']}\n")
-                f.write(f"  Emotional: {row['Emotional']}, Pos/Neg: {row['Pos / Neg']}, Age Answer: {row['Age Answer']}\n")
-                f.write(f"  Text: {row['Text'][:60]}...\n")
-                f.write("\n")
+    # Integer codes: participants in order of appearance, questions sorted by Page Ref
+    pid_codes, participants = pd.factorize(df['Participant ID'])
+    pref_codes, questions = pd.factorize(df['Page Ref'], sort=True)
+    
+    parts = []
+    parts.append("DETAILED DATA ISSUES REPORT\n")
+    parts.append("=" * 70 + "\n\n")
+    
+    # ==================== DUPLICATES ====================
+    parts.append("DUPLICATE ROWS\n")
+    parts.append("-" * 70 + "\n\n")
+    
+    duplicates = find_duplicates(df)
+    
+    if len(duplicates) == 0:
+        parts.append("No duplicate rows found.\n\n")
+    else:
+        parts.append(f"Found {len(duplicates)} rows involved in duplication:\n\n")
         
-        # ==================== PARTICIPANT COMPLETENESS ====================
-        f.write("\nPARTICIPANT QUESTION COMPLETENESS\n")
-        f.write("-" * 70 + "\n\n")
+        # Truncate the texts once, then group duplicates to show which rows are duplicates of each other
+        report_rows = duplicates.assign(**{'Short Text': duplicates['Text'].str.slice(0, 60)})
+        dup_groups = group_duplicates(report_rows, df.columns.tolist())
+        report_columns = ['CSV Row Number', 'Participant ID', 'Timestamp', 'Short Text']
         
-        completeness = check_participant_completeness(df)
+        group_num = 1
+        for group in dup_groups:
+            if len(group) > 1:
+                parts.append(f"Duplicate Group {group_num}:\n")
+                for row_number, participant, timestamp, text in group[report_columns].itertuples(index=False, name=None):
+                    parts.append(f"  - CSV Row: {row_number}, ")
+                    parts.append(f"Participant ID: {participant}, ")
+                    parts.append(f"Timestamp: {timestamp}\n")
+                    parts.append(f"    Text: {text}...\n")
+                parts.append("\n")
+                group_num += 1
+    
+    # ==================== ZERO VALUES ====================
+    parts.append("\nROWS WITH ZERO VALUES (POTENTIAL INVALID RESPONSES)\n")
+    parts.append("-" * 70 + "\n\n")
+    
+    zero_rows = find_zero_values(df)
+    
+    if len(zero_rows) == 0:
+        parts.append("No rows with zero values found.\n\n")
+    else:
+        parts.append(f"Found {len(zero_rows)} rows with zero values:\n\n")
         
-        f.write(f"Total unique questions (by Page Ref): {completeness['total_questions']}\n")
-        f.write(f"Total participants: {completeness['total_participants']}\n")
-        f.write(f"Participants with all questions: {completeness['complete_participants']}\n")
-        f.write(f"Participants missing questions: {len(completeness['missing_by_participant'])}\n\n")
+        # Truncate the texts once for all reported rows
+        report_rows = zero_rows.assign(**{'Short Text': zero_rows['Text'].str.slice(0, 60)})
+        report_columns = [
+            'CSV Row Number', 'Participant ID', 'Timestamp', 'Item Type',
+            'Emotional', 'Pos / Neg', 'Age Answer', 'Short Text'
+        ]
         
-        if completeness['missing_by_participant']:
-            f.write("Participants with missing questions:\n\n")
-            for participant, missing_qs in completeness['missing_by_participant'].items():
-                f.write(f"Participant: {participant}\n")
-                f.write(f"  Missing {len(missing_qs)} question(s):\n")
-                for q in missing_qs:
-                    f.write(f"    - {q}\n")
-                f.write("\n")
-        else:
-            f.write("All participants have answered all questions.\n")
-        
-        f.write("\n" + "=" * 70 + "\n")
-        f.write("END OF REPORT\n")
+        for row in report_rows[report_columns].itertuples(index=False, name=None):
+            row_number, participant, timestamp, item_type, emotional, pos_neg, age_answer, text = row
+            parts.append(f"CSV Row: {row_number}\n")
+            parts.append(f"  Participant ID: {participant}\n")
+            parts.append(f"  Timestamp: {timestamp}\n")
+            parts.append(f"  Item Type: {item_type}\n")
+            parts.append(f"  Emotional: {emotional}, Pos/Neg: {pos_neg}, Age Answer: {age_answer}\n")
+            parts.append(f"  Text: {text}...\n")
+            parts.append("\n")
+    
+    # ==================== PARTICIPANT COMPLETENESS ====================
+    parts.append("\nPARTICIPANT QUESTION COMPLETENESS\n")
+    parts.append("-" * 70 + "\n\n")
+    
+    completeness = check_participant_completeness(pid_codes, pref_codes, participants.tolist(), questions.tolist())
+    
+    parts.append(f"Total unique questions (by Page Ref): {completeness['total_questions']}\n")
+    parts.append(f"Total participants: {completeness['total_participants']}\n")
+    parts.append(f"Participants with all questions: {completeness['complete_participants']}\n")
+    parts.append(f"Participants missing questions: {len(completeness['missing_by_participant'])}\n\n")
+    
+    if completeness['missing_by_participant']:
+        parts.append("Participants with missing questions:\n\n")
+        for participant, missing_qs in completeness['missing_by_participant'].items():
+            parts.append(f"Participant: {participant}\n")
+            parts.append(f"  Missing {len(missing_qs)} question(s):\n")
+            for q in missing_qs:
+                parts.append(f"    - {q}\n")
+            parts.append("\n")
+    else:
+        parts.append("All participants have answered all questions.\n")
+    
+    parts.append("\n" + "=" * 70 + "\n")
+    parts.append("END OF REPORT\n")
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(''.join(parts))
     
     print(f"Report written to {output_file}")
     
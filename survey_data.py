@@ -0,0 +1,38 @@
+"""
+Survey Data Loading
+Shared loader for umfrage.csv used by the analysis scripts and the Streamlit app.
+"""
+
+import io
+
+import pandas as pd
+import numpy as np
+
+
+# Low-cardinality text columns are parsed straight into categoricals
+COLUMN_DTYPES = {
+    'Participant ID': 'category',
+    'Item Type': 'category',
+    'Page Ref': 'category',
+    'Age Question Type': 'category',
+}
+
+
+def load_data(filepath: str) -> pd.DataFrame:
+    """
+    Load the survey data from CSV with § separator.
+    The multi-byte § is swapped for a tab first so the C parser can be used.
+    """
+    with open(filepath, 'rb') as f:
+        raw = f.read().replace('§'.encode('utf-8'), b'\t')
+    df = pd.read_csv(io.BytesIO(raw), sep='\t', encoding='utf-8', engine='c', dtype=COLUMN_DTYPES)
+    return df
+
+
+def category_mask(column: pd.Series, value: str) -> np.ndarray:
+    """Boolean mask of rows equal to value, compared on the categorical codes."""
+    column = column.astype('category')
+    categories = column.cat.categories
+    if value not in categories:
+        return np.zeros(len(column), dtype=bool)
+    return column.cat.codes.to_numpy() == categories.get_loc(value)